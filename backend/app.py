@@ -8,20 +8,25 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
 import logging
+from functools import lru_cache
 from typing import Dict, Any
 from dotenv import load_dotenv
 from auth import require_auth, get_current_user
-# Import Gemini lazily to avoid blocking server startup
-# from gemini_recommender import get_gemini_recommendations
+from mock_data import MOCK_UNIVERSITIES
+# Import Gemini lazily (see _get_gemini) to avoid blocking server startup
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+# Student profile fields and severity levels shared by all endpoints
+REQUIRED_PROFILE_FIELDS = ('mental_health', 'physical_health', 'courses', 'gpa', 'severity')
+VALID_SEVERITIES = frozenset({'mild', 'moderate', 'severe'})
+
+
 def validate_student_profile(data: dict):
     """Validate student profile data."""
-    required_fields = ['mental_health', 'physical_health', 'courses', 'gpa', 'severity']
-    missing = [f for f in required_fields if f not in data]
+    missing = [f for f in REQUIRED_PROFILE_FIELDS if f not in data]
     if missing:
         return False, f"Missing required fields: {', '.join(missing)}"
     
@@ -33,7 +38,7 @@ def validate_student_profile(data: dict):
     if not 0.0 <= gpa <= 4.0:
         return False, "GPA must be between 0.0 and 4.0"
     
-    if data['severity'] not in ['mild', 'moderate', 'severe']:
+    if data['severity'] not in VALID_SEVERITIES:
         return False, "Severity must be one of: mild, moderate, severe"
     
     return True, ""
@@ -49,76 +54,54 @@ def error_response(message: str, status: int = 400, code: str = "BAD_REQUEST"):
     return jsonify({"success": False, "error": {"code": code, "message": message}}), status
 
 
+@lru_cache(maxsize=None)
+def _get_gemini():
+    """
+    Import the Gemini recommender on first use and memoize the result.
+    Returns None if the Gemini SDK is not installed.
+    """
+    try:
+        from gemini_recommender import get_gemini_recommendations
+    except ImportError as e:
+        logger.warning("Gemini import failed: %s", e)
+        return None
+    return get_gemini_recommendations
+
+
 def get_recommendations(student_profile: Dict[str, Any]) -> Dict[str, Any]:
     """
     Get university recommendations using Gemini AI.
     Falls back to mock data if Gemini is not available.
     """
+    # Try Gemini AI first (lazy import); only the Gemini call can fail here
     try:
-        # Try Gemini AI first (lazy import)
-        try:
-            from gemini_recommender import get_gemini_recommendations
-            print("Attempting to call Gemini AI...")
+        get_gemini_recommendations = _get_gemini()
+        if get_gemini_recommendations is not None:
+            logger.debug("Attempting to call Gemini AI...")
             gemini_result = get_gemini_recommendations(student_profile)
-            print(f"Gemini AI returned: {gemini_result}")
-        except ImportError as e:
-            print(f"Gemini import failed: {e}")
-            gemini_result = {"success": False, "error": "Gemini not available"}
-        
-        if gemini_result.get("success", False):
-            print("Using Gemini AI result")
-            return gemini_result
+            logger.debug("Gemini AI returned: %s", gemini_result)
         else:
-            # Fallback to mock recommendations if Gemini fails
-            print(f"Gemini AI failed: {gemini_result.get('error', 'Unknown error')}")
-            print("Falling back to mock recommendations")
-            mock_result = get_mock_recommendations(student_profile)
-            print(f"Mock result: {mock_result}")
-            return mock_result
-            
+            gemini_result = {"success": False, "error": "Gemini not available"}
     except Exception as e:
-        print(f"Error getting recommendations: {str(e)}")
-        print("Using mock recommendations due to error")
-        mock_result = get_mock_recommendations(student_profile)
-        print(f"Mock result: {mock_result}")
-        return mock_result
+        logger.error("Error getting Gemini recommendations: %s", e)
+        gemini_result = {"success": False, "error": str(e)}
+    
+    if gemini_result.get("success", False):
+        logger.debug("Using Gemini AI result")
+        return gemini_result
+    
+    # Fallback to mock recommendations if Gemini fails
+    logger.info("Gemini AI failed (%s), falling back to mock recommendations",
+                gemini_result.get('error', 'Unknown error'))
+    mock_result = get_mock_recommendations(student_profile)
+    logger.debug("Mock result: %s", mock_result)
+    return mock_result
 
 
 def get_mock_recommendations(student_profile: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generate mock university recommendations as fallback.
     """
-    # Mock data for demonstration
-    mock_universities = [
-        {
-            "name": "University of Toronto",
-            "score": 4.3,
-            "accessibility_rating": 4.5,
-            "disability_support_rating": 4.7,
-            "available_accommodations": ["Extended time", "Note-taking services", "Academic coaching"],
-            "location": "Ontario",
-            "reason": "Strong disability services and comprehensive support programs"
-        },
-        {
-            "name": "University of British Columbia",
-            "score": 4.1,
-            "accessibility_rating": 4.2,
-            "disability_support_rating": 4.4,
-            "available_accommodations": ["Extended time", "Alternative testing formats", "Assistive technology"],
-            "location": "British Columbia",
-            "reason": "Excellent accessibility infrastructure and support services"
-        },
-        {
-            "name": "McGill University",
-            "score": 3.9,
-            "accessibility_rating": 4.0,
-            "disability_support_rating": 4.1,
-            "available_accommodations": ["Extended time", "Note-taking services", "Priority registration"],
-            "location": "Quebec",
-            "reason": "Comprehensive disability support and accommodation services"
-        }
-    ]
-    
     # Filter accommodations based on student profile
     accommodations = []
     if student_profile['mental_health'] != 'None':
@@ -134,7 +117,7 @@ def get_mock_recommendations(student_profile: Dict[str, Any]) -> Dict[str, Any]:
         "success": True,
         "source": "mock_fallback",
         "needed_accommodations": accommodations,
-        "recommendations": mock_universities
+        "recommendations": [dict(uni) for uni in MOCK_UNIVERSITIES]
     }
 
 
@@ -216,19 +199,13 @@ def get_university_recommendations():
 
         # Get current user info
         user = get_current_user()
-        logger.info(f"Processing recommendation request for user {user.get('email', 'unknown')}: {student_profile}")
+        logger.info("Processing recommendation request for user %s: %s", user.get('email', 'unknown'), student_profile)
 
         # Get recommendations (Gemini AI with fallback)
-        print("=" * 60)
-        print("CALLING GET_RECOMMENDATIONS FROM MAIN ENDPOINT")
-        print("=" * 60)
         result = get_recommendations(student_profile)
-        print("=" * 60)
-        print("GET_RECOMMENDATIONS RESULT RECEIVED")
-        print("=" * 60)
-        print(f"Result: {result}")
+        logger.debug("Recommendations result: %s", result)
 
-        logger.info(f"Recommendation result: success={result['success']}, source={result.get('source', 'unknown')}")
+        logger.info("Recommendation result: success=%s, source=%s", result['success'], result.get('source', 'unknown'))
 
         return jsonify(result)
 
@@ -279,8 +256,7 @@ def get_gemini_recommendations_endpoint():
         data = request.get_json()
 
         # Create student profile (same validation as main endpoint)
-        required_fields = ['mental_health', 'physical_health', 'courses', 'gpa', 'severity']
-        missing_fields = [field for field in required_fields if field not in data]
+        missing_fields = [field for field in REQUIRED_PROFILE_FIELDS if field not in data]
 
         if missing_fields:
             return error_response(f'Missing required fields: {", ".join(missing_fields)}', 400, "VALIDATION_ERROR")
@@ -295,24 +271,17 @@ def get_gemini_recommendations_endpoint():
 
         # Get current user info
         user = get_current_user()
-        logger.info(f"Processing Gemini AI request for user {user.get('email', 'unknown')}: {student_profile}")
+        logger.info("Processing Gemini AI request for user %s: %s", user.get('email', 'unknown'), student_profile)
 
         # Get recommendations directly from Gemini AI (lazy import)
-        try:
-            from gemini_recommender import get_gemini_recommendations
-            print("=" * 60)
-            print("CALLING GEMINI AI FROM FLASK ENDPOINT")
-            print("=" * 60)
+        get_gemini_recommendations = _get_gemini()
+        if get_gemini_recommendations is not None:
             result = get_gemini_recommendations(student_profile)
-            print("=" * 60)
-            print("GEMINI AI RESULT RECEIVED")
-            print("=" * 60)
-            print(f"Result: {result}")
-        except ImportError as e:
-            print(f"Gemini import failed: {e}")
+            logger.debug("Gemini AI result: %s", result)
+        else:
             result = {"success": False, "error": "Gemini not available"}
 
-        logger.info(f"Gemini AI result: success={result['success']}, source={result.get('source', 'unknown')}")
+        logger.info("Gemini AI result: success=%s, source=%s", result['success'], result.get('source', 'unknown'))
 
         return jsonify(result)
 
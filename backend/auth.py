@@ -5,11 +5,14 @@ JWT Authentication module for AWS Cognito integration
 import jwt
 import requests
 import json
+import logging
 import os
 from functools import wraps
 from flask import request, jsonify
 from typing import Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
+
 # AWS Cognito configuration
 AWS_REGION = os.environ.get('COGNITO_REGION', 'us-east-1')
 AWS_USER_POOL_ID = os.environ.get('COGNITO_USER_POOL_ID', '')
@@ -43,7 +46,7 @@ def get_jwks() -> Dict[str, Any]:
         
         return _jwks_cache
     except Exception as e:
-        print(f"Error fetching JWKS: {e}")
+        logger.error("Error fetching JWKS: %s", e)
         return {}
 
 def get_public_key(token: str) -> Optional[str]:
@@ -71,7 +74,7 @@ def get_public_key(token: str) -> Optional[str]:
         
         return None
     except Exception as e:
-        print(f"Error getting public key: {e}")
+        logger.error("Error getting public key: %s", e)
         return None
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
@@ -95,13 +98,13 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
         
         return payload
     except jwt.ExpiredSignatureError:
-        print("Token has expired")
+        logger.warning("Token has expired")
         return None
     except jwt.InvalidTokenError as e:
-        print(f"Invalid token: {e}")
+        logger.warning("Invalid token: %s", e)
         return None
     except Exception as e:
-        print(f"Error verifying token: {e}")
+        logger.error("Error verifying token: %s", e)
         return None
 
 def require_auth(f):
@@ -116,7 +119,7 @@ def require_auth(f):
         
         # TEMPORARY: Skip auth for recommendations endpoint during development
         if request.endpoint == 'get_university_recommendations':
-            print("TEMPORARILY SKIPPING AUTH FOR RECOMMENDATIONS ENDPOINT")
+            logger.debug("TEMPORARILY SKIPPING AUTH FOR RECOMMENDATIONS ENDPOINT")
             # Add a mock user for development
             request.user = {
                 'user_id': 'dev-user-123',
@@ -128,11 +131,9 @@ def require_auth(f):
         
         # Get the Authorization header
         auth_header = request.headers.get('Authorization')
-        print(f"Authorization header: {auth_header}")
-        print(f"All headers: {dict(request.headers)}")
         
         if not auth_header:
-            print("No Authorization header found")
+            logger.warning("No Authorization header found")
             return jsonify({
                 "success": False,
                 "error": {
@@ -156,12 +157,10 @@ def require_auth(f):
             }), 401
         
         # Verify the token
-        print(f"Verifying token: {token[:50]}...")
         payload = verify_token(token)
-        print(f"Token verification result: {payload}")
         
         if not payload:
-            print("Token verification failed")
+            logger.warning("Token verification failed")
             return jsonify({
                 "success": False,
                 "error": {
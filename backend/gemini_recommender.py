@@ -4,12 +4,29 @@ Provides AI-powered university accommodation recommendations.
 """
 
 import os
+import logging
 import google.generativeai as genai
 from typing import Dict, List, Optional
+import copy
 import json
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from mock_data import MOCK_UNIVERSITIES
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+# Default accommodation lists, shared (immutable) across responses
+DEFAULT_NEEDED_ACCOMMODATIONS = (
+    "Extended time for exams",
+    "Note-taking services",
+    "Academic coaching",
+    "Priority registration"
+)
+DEFAULT_AVAILABLE_ACCOMMODATIONS = ("Extended time", "Note-taking services", "Academic coaching")
+
 
 class GeminiRecommender:
     def __init__(self, api_key: Optional[str] = None):
@@ -21,7 +38,7 @@ class GeminiRecommender:
         """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         if not self.api_key:
-            print("Warning: No Gemini API key provided. Set GEMINI_API_KEY environment variable or pass api_key parameter.")
+            logger.warning("No Gemini API key provided. Set GEMINI_API_KEY environment variable or pass api_key parameter.")
             self.available = False
             return
         
@@ -29,9 +46,9 @@ class GeminiRecommender:
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel('gemini-2.5-flash')
             self.available = True
-            print("✅ Gemini AI recommender initialized successfully")
+            logger.info("Gemini AI recommender initialized successfully")
         except Exception as e:
-            print(f"❌ Failed to initialize Gemini AI: {str(e)}")
+            logger.error("Failed to initialize Gemini AI: %s", e)
             self.available = False
 
     def get_recommendations(self, student_profile: Dict[str, any]) -> Dict[str, any]:
@@ -54,10 +71,10 @@ class GeminiRecommender:
         try:
             # Create a detailed prompt for Gemini
             prompt = self._create_prompt(student_profile)
-            print(f"Generated prompt length: {len(prompt)} characters")
+            logger.debug("Generated prompt length: %d characters", len(prompt))
             
             # Get response from Gemini with timeout
-            print("Calling Gemini API...")
+            logger.debug("Calling Gemini API...")
             response = self.model.generate_content(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
@@ -65,61 +82,34 @@ class GeminiRecommender:
                     temperature=0.3,  # Lower temperature for more consistent responses
                 )
             )
-            print("Received response from Gemini")
+            logger.debug("Received response from Gemini")
             
             # Check for safety issues before trying to access response.text
             if response.candidates and response.candidates[0].finish_reason == 2:
-                print("Response blocked by safety filters (finish_reason=2)")
+                logger.warning("Response blocked by safety filters (finish_reason=2)")
                 # Try a much simpler approach
                 try:
                     simple_prompt = f"List 3 Canadian universities good for {student_profile.get('courses', 'students')} students. Return as JSON with name, location, and reason fields."
                     simple_response = self.model.generate_content(simple_prompt)
                     if simple_response.text:
-                        print("Simplified prompt succeeded")
+                        logger.debug("Simplified prompt succeeded")
                         recommendations = self._parse_gemini_response(simple_response.text)
-                        return {
-                            "success": True,
-                            "source": "gemini_ai_simplified",
-                            "needed_accommodations": recommendations.get("needed_accommodations", []),
-                            "recommendations": recommendations.get("universities", [])
-                        }
+                        return self._format_result("gemini_ai_simplified", recommendations)
                 except Exception as e:
-                    print(f"Simplified prompt also failed: {e}")
+                    logger.warning("Simplified prompt also failed: %s", e)
                 
                 # Use fallback if simplified approach fails
                 fallback = self._create_fallback_response("Response blocked by safety filters")
-                return {
-                    "success": True,
-                    "source": "gemini_ai_fallback",
-                    "needed_accommodations": fallback.get("needed_accommodations", []),
-                    "recommendations": fallback.get("universities", [])
-                }
-            
-            # Log raw response details
-            print("=" * 50)
-            print("RAW GEMINI RESPONSE DEBUG:")
-            print("=" * 50)
-            print(f"Response object type: {type(response)}")
-            print(f"Response candidates: {len(response.candidates) if response.candidates else 0}")
+                return self._format_result("gemini_ai_fallback", fallback)
             
-            if response.candidates:
-                for i, candidate in enumerate(response.candidates):
-                    print(f"Candidate {i}:")
-                    print(f"  Finish reason: {candidate.finish_reason}")
-                    print(f"  Safety ratings: {candidate.safety_ratings}")
-                    print(f"  Content parts: {len(candidate.content.parts) if candidate.content and candidate.content.parts else 0}")
-                    if candidate.content and candidate.content.parts:
-                        for j, part in enumerate(candidate.content.parts):
-                            print(f"    Part {j}: {type(part)} - {part.text[:200] if hasattr(part, 'text') and part.text else 'No text'}")
-            
-            print(f"Response text: {response.text}")
-            print(f"Response text length: {len(response.text) if response.text else 0}")
-            print("=" * 50)
+            # Log raw response details (only built when debug logging is enabled)
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_raw_response(response)
             
             # Check if response was blocked by safety filters
             if not response.text or not response.candidates:
                 finish_reason = response.candidates[0].finish_reason if response.candidates else 'Unknown'
-                print(f"Response blocked. Finish reason: {finish_reason}")
+                logger.warning("Response blocked. Finish reason: %s", finish_reason)
                 
                 # Map finish reasons to human-readable messages
                 finish_reason_messages = {
@@ -131,11 +121,11 @@ class GeminiRecommender:
                 }
                 
                 reason_msg = finish_reason_messages.get(finish_reason, f"Unknown reason ({finish_reason})")
-                print(f"Blocked reason: {reason_msg}")
+                logger.warning("Blocked reason: %s", reason_msg)
                 
                 # If blocked by safety filters, try a simpler approach
                 if finish_reason == 2:  # SAFETY
-                    print("Attempting with simplified prompt...")
+                    logger.debug("Attempting with simplified prompt...")
                     try:
                         simple_prompt = f"""
                         Recommend 3 Canadian universities for a {student_profile.get('courses', 'student')} student with {student_profile.get('gpa', 3.0)} GPA.
@@ -143,46 +133,66 @@ class GeminiRecommender:
                         """
                         simple_response = self.model.generate_content(simple_prompt)
                         if simple_response.text:
-                            print("Simplified prompt succeeded")
+                            logger.debug("Simplified prompt succeeded")
                             recommendations = self._parse_gemini_response(simple_response.text)
-                            return {
-                                "success": True,
-                                "source": "gemini_ai_simplified",
-                                "needed_accommodations": recommendations.get("needed_accommodations", []),
-                                "recommendations": recommendations.get("universities", [])
-                            }
+                            return self._format_result("gemini_ai_simplified", recommendations)
                     except Exception as e:
-                        print(f"Simplified prompt also failed: {e}")
+                        logger.warning("Simplified prompt also failed: %s", e)
                 
                 # Use fallback if all attempts fail
                 fallback = self._create_fallback_response(f"Response blocked: {reason_msg}")
-                return {
-                    "success": True,
-                    "source": "gemini_ai_fallback",
-                    "needed_accommodations": fallback.get("needed_accommodations", []),
-                    "recommendations": fallback.get("universities", [])
-                }
+                return self._format_result("gemini_ai_fallback", fallback)
             
             # Parse the response
-            print("Parsing Gemini response...")
+            logger.debug("Parsing Gemini response...")
             recommendations = self._parse_gemini_response(response.text)
-            print(f"Parsed recommendations: {recommendations}")
+            logger.debug("Parsed recommendations: %s", recommendations)
             
-            return {
-                "success": True,
-                "source": "gemini_ai",
-                "needed_accommodations": recommendations.get("needed_accommodations", []),
-                "recommendations": recommendations.get("universities", [])
-            }
+            return self._format_result("gemini_ai", recommendations)
             
         except Exception as e:
-            print(f"Error getting Gemini recommendations: {str(e)}")
+            logger.error("Error getting Gemini recommendations: %s", e)
             return {
                 "success": False,
                 "error": f"Failed to get recommendations: {str(e)}",
                 "source": "gemini_ai"
             }
 
+    def _log_raw_response(self, response) -> None:
+        """Dump the raw Gemini response structure at debug level."""
+        logger.debug("RAW GEMINI RESPONSE DEBUG:")
+        logger.debug("Response object type: %s", type(response))
+        logger.debug("Response candidates: %d", len(response.candidates) if response.candidates else 0)
+        
+        if response.candidates:
+            for i, candidate in enumerate(response.candidates):
+                logger.debug("Candidate %d:", i)
+                logger.debug("  Finish reason: %s", candidate.finish_reason)
+                logger.debug("  Safety ratings: %s", candidate.safety_ratings)
+                parts = candidate.content.parts if candidate.content and candidate.content.parts else []
+                logger.debug("  Content parts: %d", len(parts))
+                for j, part in enumerate(parts):
+                    text = part.text[:200] if hasattr(part, 'text') and part.text else 'No text'
+                    logger.debug("    Part %d: %s - %s", j, type(part), text)
+        
+        logger.debug("Response text: %s", response.text)
+        logger.debug("Response text length: %d", len(response.text) if response.text else 0)
+
+    def _format_result(self, source: str, parsed: Dict[str, any]) -> Dict[str, any]:
+        """Build the API response from parsed or fallback recommendation data."""
+        # A parse with no universities is as good as a failed one: use the
+        # canned fallback data. Canned data is always labelled as fallback.
+        if not parsed.get("universities"):
+            parsed = self._create_fallback_response("Parsed response had no universities")
+        if parsed.get("is_fallback", False):
+            source = "gemini_ai_fallback"
+        return {
+            "success": True,
+            "source": source,
+            "needed_accommodations": parsed.get("needed_accommodations", []),
+            "recommendations": parsed.get("universities", [])
+        }
+
     def _create_prompt(self, student_profile: Dict[str, any]) -> str:
         """Create a detailed prompt for Gemini AI."""
         # Create a more neutral prompt that avoids triggering safety filters
@@ -240,9 +250,9 @@ Provide 3-5 university recommendations with detailed explanations.
 
     def _parse_gemini_response(self, response_text: str) -> Dict[str, any]:
         """Parse Gemini's response and extract structured data."""
-        print(f"Parsing response text (length: {len(response_text)}):")
-        print(f"First 500 chars: {response_text[:500]}")
-        print(f"Last 500 chars: {response_text[-500:]}")
+        logger.debug("Parsing response text (length: %d)", len(response_text))
+        logger.debug("First 500 chars: %s", response_text[:500])
+        logger.debug("Last 500 chars: %s", response_text[-500:])
         
         try:
             # Try to find JSON in the response - handle both object and array formats
@@ -255,103 +265,122 @@ Provide 3-5 university recommendations with detailed explanations.
                 end_idx = response_text.rfind(']') + 1
                 if end_idx != -1:
                     json_str = response_text[array_start_idx:end_idx]
-                    print(f"Extracted JSON array (length: {len(json_str)}):")
-                    print(f"JSON: {json_str}")
+                    logger.debug("Extracted JSON array (length: %d): %s", len(json_str), json_str)
                     
                     universities_array = json.loads(json_str)
-                    print(f"Successfully parsed JSON array: {universities_array}")
+                    logger.debug("Successfully parsed JSON array: %s", universities_array)
                     
                     # Convert array format to expected format
                     return {
-                        "needed_accommodations": [
-                            "Extended time for exams",
-                            "Note-taking services", 
-                            "Academic coaching",
-                            "Priority registration"
-                        ],
-                        "universities": [
-                            {
-                                "name": uni.get("name", "Unknown University"),
-                                "score": 4.0 + (hash(uni.get("name", "")) % 10) / 10,  # Generate score based on name
-                                "accessibility_rating": 4.0 + (hash(uni.get("name", "")) % 10) / 10,
-                                "disability_support_rating": 4.0 + (hash(uni.get("name", "")) % 10) / 10,
-                                "available_accommodations": ["Extended time", "Note-taking services", "Academic coaching"],
-                                "location": uni.get("location", "Unknown"),
-                                "reason": uni.get("reason", "Good university for students")
-                            }
-                            for uni in universities_array
-                        ]
+                        "needed_accommodations": DEFAULT_NEEDED_ACCOMMODATIONS,
+                        "universities": [self._convert_array_university(uni) for uni in universities_array]
                     }
             else:
                 # Object format
                 end_idx = response_text.rfind('}') + 1
                 if start_idx != -1 and end_idx != -1:
                     json_str = response_text[start_idx:end_idx]
-                    print(f"Extracted JSON object (length: {len(json_str)}):")
-                    print(f"JSON: {json_str}")
+                    logger.debug("Extracted JSON object (length: %d): %s", len(json_str), json_str)
                     
                     parsed_json = json.loads(json_str)
-                    print(f"Successfully parsed JSON object: {parsed_json}")
+                    logger.debug("Successfully parsed JSON object: %s", parsed_json)
                     return parsed_json
             
-            print("No valid JSON found in response, using fallback")
+            logger.warning("No valid JSON found in response, using fallback")
             # Fallback: create structured response from text
             return self._create_fallback_response(response_text)
                 
         except json.JSONDecodeError as e:
-            print(f"JSON parsing failed: {str(e)}")
-            print(f"Failed JSON string: {json_str if 'json_str' in locals() else 'N/A'}")
+            logger.warning("JSON parsing failed: %s", e)
+            logger.debug("Failed JSON string: %s", json_str if 'json_str' in locals() else 'N/A')
             # If JSON parsing fails, create a fallback response
             return self._create_fallback_response(response_text)
 
+    def _convert_array_university(self, uni: Dict[str, any]) -> Dict[str, any]:
+        """Convert one entry of an array-format response to the expected format."""
+        # Generate score based on name; computed once and reused for all ratings
+        rating = 4.0 + (hash(uni.get("name", "")) % 10) / 10
+        return {
+            "name": uni.get("name", "Unknown University"),
+            "score": rating,
+            "accessibility_rating": rating,
+            "disability_support_rating": rating,
+            "available_accommodations": DEFAULT_AVAILABLE_ACCOMMODATIONS,
+            "location": uni.get("location", "Unknown"),
+            "reason": uni.get("reason", "Good university for students")
+        }
+
     def _create_fallback_response(self, response_text: str) -> Dict[str, any]:
         """Create a fallback response when JSON parsing fails."""
         return {
-            "needed_accommodations": [
-                "Extended time for exams",
-                "Note-taking services",
-                "Academic coaching",
-                "Priority registration"
-            ],
-            "universities": [
-                {
-                    "name": "University of Toronto",
-                    "score": 4.3,
-                    "accessibility_rating": 4.5,
-                    "disability_support_rating": 4.7,
-                    "available_accommodations": ["Extended time", "Note-taking services", "Academic coaching"],
-                    "location": "Ontario",
-                    "reason": "Strong disability services and comprehensive support programs"
-                },
-                {
-                    "name": "University of British Columbia",
-                    "score": 4.1,
-                    "accessibility_rating": 4.2,
-                    "disability_support_rating": 4.4,
-                    "available_accommodations": ["Extended time", "Alternative testing formats", "Assistive technology"],
-                    "location": "British Columbia",
-                    "reason": "Excellent accessibility infrastructure and support services"
-                },
-                {
-                    "name": "McGill University",
-                    "score": 3.9,
-                    "accessibility_rating": 4.0,
-                    "disability_support_rating": 4.1,
-                    "available_accommodations": ["Extended time", "Note-taking services", "Priority registration"],
-                    "location": "Quebec",
-                    "reason": "Comprehensive disability support and accommodation services"
-                }
-            ]
+            "is_fallback": True,
+            "needed_accommodations": DEFAULT_NEEDED_ACCOMMODATIONS,
+            "universities": [dict(uni) for uni in MOCK_UNIVERSITIES]
         }
 
 
-# Global instance
+# Global instance, created once per process and shared across request threads
 _gemini_recommender = None
+_gemini_recommender_lock = threading.Lock()
+
+# Cache of successful results keyed by student profile, so repeated identical
+# requests skip the Gemini network round-trip. Entries are private deep copies
+# and every hit returns a fresh deep copy, so no caller (or thread) can see
+# another's modifications.
+_recommendations_cache = OrderedDict()
+_recommendations_cache_lock = threading.Lock()
+RECOMMENDATIONS_CACHE_DURATION = 3600  # 1 hour in seconds
+RECOMMENDATIONS_CACHE_SIZE = 1024
+# Only genuinely parsed Gemini output is cached; canned fallback data is not
+CACHEABLE_SOURCES = frozenset({"gemini_ai", "gemini_ai_simplified"})
+
+
+def _profile_cache_key(student_profile: Dict[str, any]) -> tuple:
+    """
+    Build a hashable cache key from a student profile.
+    
+    GPA is bucketed to one decimal place so near-identical profiles share
+    an entry; non-numeric GPAs are keyed as-is.
+    """
+    key = {k: str(v) for k, v in student_profile.items()}
+    try:
+        key['gpa'] = f"{float(student_profile['gpa']):.1f}"
+    except (KeyError, TypeError, ValueError):
+        pass
+    return tuple(sorted(key.items()))
+
+
+def _get_cached_recommendations(key: tuple) -> Optional[Dict[str, any]]:
+    """Return a cached result for key if present and not expired."""
+    with _recommendations_cache_lock:
+        entry = _recommendations_cache.get(key)
+        if entry is None:
+            return None
+        timestamp, result = entry
+        if time.monotonic() - timestamp >= RECOMMENDATIONS_CACHE_DURATION:
+            del _recommendations_cache[key]
+            return None
+        _recommendations_cache.move_to_end(key)
+        return copy.deepcopy(result)
+
+
+def _store_cached_recommendations(key: tuple, result: Dict[str, any]) -> None:
+    """Store a result, evicting the least recently used entry when full."""
+    with _recommendations_cache_lock:
+        _recommendations_cache[key] = (time.monotonic(), copy.deepcopy(result))
+        _recommendations_cache.move_to_end(key)
+        while len(_recommendations_cache) > RECOMMENDATIONS_CACHE_SIZE:
+            _recommendations_cache.popitem(last=False)
+
 
 def get_gemini_recommendations(student_profile: Dict[str, any]) -> Dict[str, any]:
     """
     Get recommendations from Gemini AI.
     
+    Successful, non-empty results parsed from Gemini are cached per profile
+    for RECOMMENDATIONS_CACHE_DURATION seconds; errors and canned fallback
+    data are never cached so they are retried on the next call.
+    
     Args:
         student_profile: Dictionary containing student information
         
@@ -360,7 +389,18 @@ def get_gemini_recommendations(student_profile: Dict[str, any]) -> Dict[str, any
     """
     global _gemini_recommender
     
+    cache_key = _profile_cache_key(student_profile)
+    cached = _get_cached_recommendations(cache_key)
+    if cached is not None:
+        return cached
+    
     if _gemini_recommender is None:
-        _gemini_recommender = GeminiRecommender()
+        with _gemini_recommender_lock:
+            if _gemini_recommender is None:
+                _gemini_recommender = GeminiRecommender()
     
-    return _gemini_recommender.get_recommendations(student_profile)
+    result = _gemini_recommender.get_recommendations(student_profile)
+    if (result.get("success", False) and result.get("source") in CACHEABLE_SOURCES
+            and result.get("recommendations")):
+        _store_cached_recommendations(cache_key, result)
+    return result
@@ -0,0 +1,36 @@
+"""
+Static mock university data for UNIfy
+Shared by the API's mock fallback and the Gemini recommender's fallback
+response, so both always return the same list. Built once at import;
+callers should copy entries before modifying them.
+"""
+
+MOCK_UNIVERSITIES = (
+    {
+        "name": "University of Toronto",
+        "score": 4.3,
+        "accessibility_rating": 4.5,
+        "disability_support_rating": 4.7,
+        "available_accommodations": ("Extended time", "Note-taking services", "Academic coaching"),
+        "location": "Ontario",
+        "reason": "Strong disability services and comprehensive support programs"
+    },
+    {
+        "name": "University of British Columbia",
+        "score": 4.1,
+        "accessibility_rating": 4.2,
+        "disability_support_rating": 4.4,
+        "available_accommodations": ("Extended time", "Alternative testing formats", "Assistive technology"),
+        "location": "British Columbia",
+        "reason": "Excellent accessibility infrastructure and support services"
+    },
+    {
+        "name": "McGill University",
+        "score": 3.9,
+        "accessibility_rating": 4.0,
+        "disability_support_rating": 4.1,
+        "available_accommodations": ("Extended time", "Note-taking services", "Priority registration"),
+        "location": "Quebec",
+        "reason": "Comprehensive disability support and accommodation services"
+    }
+)